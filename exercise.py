@@ -1,108 +1,163 @@
+import calendar
 import pickle
+import re
+import shelve
+import sys
 from abc import ABC, abstractmethod
-from collections import UserDict
-from datetime import datetime, timedelta
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache, wraps
 
+try:
+    import readline  # noqa: F401 - enables line editing and history for input()
+except ImportError:
+    pass
 
-class Field:
-    def __init__(self, value):
-        self.value = value
 
-    def __str__(self):
-        return str(self.value)
+_PHONE_RE = re.compile(r"[0-9]{10}")
 
-class Name(Field):
-    pass
+def _build_doy_table(year):
+    table = [0] * (13 * 32)
+    jan1 = date(year, 1, 1).toordinal()
+    for month in range(1, 13):
+        for day in range(1, 32):
+            try:
+                table[month * 32 + day] = date(year, month, day).toordinal() - jan1 + 1
+            except ValueError:
+                pass
+    return table
 
-class Phone(Field):
-    def __init__(self, value):
-        if not self.is_valid_phone(value):
-            raise ValueError("Invalid phone number format. Phone should consist of 10 digits.")
-        super().__init__(value)
+# day-of-year lookup tables indexed by month * 32 + day
+_DOY_COMMON = _build_doy_table(2001)
+_DOY_LEAP = _build_doy_table(2000)
+_DOY_COMMON[2 * 32 + 29] = _DOY_COMMON[3 * 32 + 1]  # Feb 29 maps to Mar 1 off leap years
 
-    @staticmethod
-    def is_valid_phone(phone):
-        return phone.isdigit() and len(phone) == 10
+BirthdayData = namedtuple("BirthdayData", ("value", "date", "month", "day"))
 
-class Birthday(Field):
-    def __init__(self, value):
-        try:
-            datetime.strptime(value, "%d.%m.%Y")
-            self.value = value
-        except ValueError:
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+def _validate_phone(phone):
+    if _PHONE_RE.fullmatch(phone) is None:
+        raise ValueError("Invalid phone number format. Phone should consist of 10 digits.")
+    return phone
 
-    def __str__(self):
-        return self.value
+@lru_cache(maxsize=1024)
+def _parse_birthday(value):
+    try:
+        day, month, year = value.split(".")
+        parsed = date(int(year), int(month), int(day))
+    except ValueError:
+        raise ValueError("Invalid date format. Use DD.MM.YYYY")
+    return BirthdayData(value, parsed, parsed.month, parsed.day)
 
 
 class Record:
+    __slots__ = ("name", "phones", "_phone_index", "birthday")
+
     def __init__(self, name):
-        self.name = Name(name)
+        self.name = name
         self.phones = []
+        self._phone_index = {}
         self.birthday = None
 
     def add_phone(self, phone):
-        self.phones.append(Phone(phone))
+        if phone in self._phone_index:
+            raise ValueError("Phone number already exists")
+        self.phones.append(_validate_phone(phone))
+        self._phone_index[phone] = len(self.phones) - 1
 
     def remove_phone(self, phone):
-        for p in self.phones:
-            if p.value == phone:
-                self.phones.remove(p)
-                return self
+        index = self._phone_index.pop(phone, None)
+        if index is not None:
+            last = self.phones.pop()
+            if index < len(self.phones):
+                self.phones[index] = last
+                self._phone_index[last] = index
+            return self
 
     def edit_phone(self, old_phone, new_phone):
-        for i, p in enumerate(self.phones):
-            if p.value == old_phone:
-                self.phones[i] = Phone(new_phone)
-                return self
-        raise ValueError("Phone number not found")
+        index = self._phone_index.get(old_phone)
+        if index is None:
+            raise ValueError("Phone number not found")
+        if new_phone != old_phone and new_phone in self._phone_index:
+            raise ValueError("Phone number already exists")
+        self.phones[index] = _validate_phone(new_phone)
+        del self._phone_index[old_phone]
+        self._phone_index[new_phone] = index
+        return self
 
     def add_birthday(self, birthday):
-        self.birthday = Birthday(birthday)
+        self.birthday = _parse_birthday(birthday)
+
+    def _next_birthday(self, today):
+        next_birthday = self.birthday.date.replace(year=today.year)
+        if next_birthday.toordinal() < today.toordinal():
+            next_birthday = next_birthday.replace(year=today.year + 1)
+        return next_birthday
 
     def get_days_to_birthday(self):
         if self.birthday:
-            today = datetime.today()
-            birthday_date = datetime.strptime(self.birthday.value, "%d.%m.%Y")
-            next_birthday = birthday_date.replace(year=today.year)
-            if next_birthday < today:
-                next_birthday = next_birthday.replace(year=today.year + 1)
-            return (next_birthday - today).days
+            today = date.today()
+            return (self._next_birthday(today) - today).days
         return None
 
     def __str__(self):
-        phones_str = ', '.join(str(phone) for phone in self.phones)
+        phones_str = ', '.join(self.phones)
         birthday_str = self.birthday.value if self.birthday else "N/A"
-        return f"Ім'я: {self.name.value}, Телефони: {phones_str}, День народження: {birthday_str}"
+        return f"Ім'я: {self.name}, Телефони: {phones_str}, День народження: {birthday_str}"
 
 
-class AddressBook(UserDict):
+_BIRTHDAY_INDEX_KEY = "__birthday_index__"
+
+class AddressBook(dict):
+    def __init__(self, shelf=None):
+        super().__init__()
+        self._shelf = shelf
+        self._birthday_index = shelf.get(_BIRTHDAY_INDEX_KEY, {}) if shelf is not None else {}
+
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name] = record
+        if record.birthday:
+            self.index_birthday(record)
+
+    def index_birthday(self, record):
+        self._birthday_index[record.name] = (record.birthday.month, record.birthday.day)
 
     def find(self, name):
-        return self.data.get(name, None)
+        record = self.get(name)
+        if record is None and self._shelf is not None and name != _BIRTHDAY_INDEX_KEY:
+            record = self._shelf.get(name)
+            if record is not None:
+                self[name] = record
+        return record
+
+    def all_records(self):
+        if self._shelf is not None:
+            for name in self._shelf:
+                if name != _BIRTHDAY_INDEX_KEY and name not in self:
+                    self[name] = self._shelf[name]
+        return self.values()
 
     def get_upcoming_birthdays(self, days=7):
-        today = datetime.today()
+        today = date.today()
+        today_ord = today.toordinal()
+        today_year = today.year
+        doy_table = _DOY_LEAP if calendar.isleap(today_year) else _DOY_COMMON
+        jan1_ord = date(today_year, 1, 1).toordinal() - 1
         upcoming_birthdays = []
-        for record in self.data.values():
-            if record.birthday:
-                days_to_birthday = record.get_days_to_birthday()
-                if days_to_birthday is not None and days_to_birthday <= days:
-                    birthday_date = datetime.strptime(record.birthday.value, "%d.%m.%Y")
-                    next_birthday = birthday_date.replace(year=today.year)
-                    if next_birthday < today:
-                        next_birthday = next_birthday.replace(year=today.year + 1)
-                    if next_birthday.weekday() == 5:
-                        next_birthday += timedelta(days=2)
-                    elif next_birthday.weekday() == 6:
-                        next_birthday += timedelta(days=1)
-                    upcoming_birthdays.append({
-                        "name": record.name.value,
-                        "birthday": next_birthday.strftime("%d.%m.%Y")
-                    })
+        append_hit = upcoming_birthdays.append
+        for name, (month, day) in self._birthday_index.items():
+            delta = jan1_ord + doy_table[month * 32 + day] - today_ord
+            if delta < 0:
+                delta += 366 if doy_table is _DOY_LEAP else 365
+            if delta <= days:
+                next_birthday = date.fromordinal(today_ord + delta)
+                if next_birthday.weekday() == 5:
+                    next_birthday += timedelta(days=2)
+                elif next_birthday.weekday() == 6:
+                    next_birthday += timedelta(days=1)
+                append_hit({
+                    "name": name,
+                    "birthday": next_birthday.strftime("%d.%m.%Y")
+                })
         return upcoming_birthdays
 
 
@@ -124,8 +179,9 @@ class ConsoleInterface(UserInterface):
         print(message)
 
     def show_contacts(self, contacts):
-        for contact in contacts:
-            print(contact)
+        lines = '\n'.join(str(contact) for contact in contacts)
+        if lines:
+            sys.stdout.write(lines + '\n')
 
     def show_help(self):
         help_message = """
@@ -144,11 +200,12 @@ class ConsoleInterface(UserInterface):
 
 
 def input_error(handler):
+    @wraps(handler)
     def wrapper(*args, **kwargs):
         try:
             return handler(*args, **kwargs)
         except (KeyError, ValueError, IndexError) as e:
-            return str(e)
+            return f"{type(e).__name__}: {e.args[0] if e.args else ''}"
     return wrapper
 
 
@@ -179,19 +236,16 @@ def show_phone(args, book: AddressBook):
     name = args[0]
     record = book.find(name)
     if record:
-        return ', '.join(phone.value for phone in record.phones)
+        return ', '.join(record.phones)
     return "Contact not found."
 
-@input_error
-def show_all(args, book: AddressBook):
-    return str(book)
-
 @input_error
 def add_birthday(args, book: AddressBook):
     name, birthday = args
     record = book.find(name)
     if record:
         record.add_birthday(birthday)
+        book.index_birthday(record)
         return f"Birthday added for {name}."
     return "Contact not found."
 
@@ -211,41 +265,40 @@ def birthdays(args, book: AddressBook):
     return '\n'.join(f"{item['name']}: {item['birthday']}" for item in upcoming_birthdays)
 
 
-def save_data(book, filename="addressbook.pkl"):
-    with open(filename, "wb") as f:
-        pickle.dump(book, f)
-
-def load_data(filename="addressbook.pkl"):
-    try:
-        with open(filename, "rb") as f:
-            return pickle.load(f)
-    except FileNotFoundError:
-        return AddressBook()
-
+def save_data(book, filename="addressbook.db"):
+    shelf = book._shelf
+    if shelf is None:
+        shelf = shelve.open(filename, protocol=pickle.HIGHEST_PROTOCOL)
+    for name, record in book.items():
+        shelf[name] = record
+    shelf[_BIRTHDAY_INDEX_KEY] = book._birthday_index
+    shelf.close()
+    book._shelf = None
+
+def load_data(filename="addressbook.db"):
+    return AddressBook(shelve.open(filename, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+_HANDLERS = {
+    "hello": lambda args, book, interface: interface.show_message("How can I help you?"),
+    "add": lambda args, book, interface: interface.show_message(add_contact(args, book)),
+    "change": lambda args, book, interface: interface.show_message(change_contact(args, book)),
+    "phone": lambda args, book, interface: interface.show_message(show_phone(args, book)),
+    "all": lambda args, book, interface: interface.show_contacts(book.all_records()),
+    "add-birthday": lambda args, book, interface: interface.show_message(add_birthday(args, book)),
+    "show-birthday": lambda args, book, interface: interface.show_message(show_birthday(args, book)),
+    "birthdays": lambda args, book, interface: interface.show_message(birthdays(args, book)),
+    "help": lambda args, book, interface: interface.show_help(),
+}
 
 def process_command(command, args, book, interface):
-    if command == "hello":
-        interface.show_message("How can I help you?")
-    elif command == "add":
-        interface.show_message(add_contact(args.split(), book))
-    elif command == "change":
-        interface.show_message(change_contact(args.split(), book))
-    elif command == "phone":
-        interface.show_message(show_phone(args.split(), book))
-    elif command == "all":
-        interface.show_contacts(book.data.values())
-    elif command == "add-birthday":
-        interface.show_message(add_birthday(args.split(), book))
-    elif command == "show-birthday":
-        interface.show_message(show_birthday(args.split(), book))
-    elif command == "birthdays":
-        interface.show_message(birthdays(args.split(), book))
-    elif command == "help":
-        interface.show_help()
-    elif command in ["close", "exit"]:
+    if command in ("close", "exit"):
         interface.show_message("Good bye!")
         save_data(book)
         return False
+    handler = _HANDLERS.get(command)
+    if handler:
+        handler(args, book, interface)
     else:
         interface.show_message("Invalid command. Use 'help' to see available commands.")
     return True
@@ -257,8 +310,11 @@ def main():
     interface.show_message("Welcome to the assistant bot!")
     
     while True:
-        user_input = input("Enter a command: ").lower()
-        command, args = user_input.split(maxsplit=1) if " " in user_input else (user_input, "")
+        parts = input("Enter a command: ").split()
+        if not parts:
+            continue
+        command = parts[0].lower()
+        args = parts[1:]
         if not process_command(command, args, book, interface):
             break
 